@@ -1,20 +1,39 @@
 # travel_ai_agent.py - Travel AI backend server
 
 import os  # For environment variables and file paths
+import re  # For query dispatch patterns
+from collections import OrderedDict  # For the LRU cache of Gemini responses
+import contextlib  # For wrapping the per-request DB connection
+from typing import Optional  # For optional return annotations
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError  # For bounded Gemini I/O
 import google.generativeai as genai  # Google Gemini AI SDK
-from flask import Flask, request, jsonify  # Flask web framework
+from flask import Flask, request, jsonify, g, has_request_context  # Flask web framework
+from flask.json.provider import JSONProvider  # Base class for custom JSON serialization
 from flask_cors import CORS  # For enabling CORS
+import orjson  # Fast JSON serializer
+from waitress import serve  # Production WSGI server
 import sys  # For error output
-import threading  # For running Flask in a separate thread
-import psycopg2  # PostgreSQL database adapter
-from datetime import date  # For handling date objects from DB
+import threading  # For guarding shared caches across request threads
+import time  # For cache expiry timestamps
+import atexit  # For closing the connection pool on shutdown
+import psycopg  # PostgreSQL database adapter (v3)
+from psycopg.conninfo import make_conninfo  # For building the pool connection string
+from psycopg.rows import dict_row  # Row factory returning dicts keyed by column name
+from psycopg_pool import ConnectionPool, PoolTimeout  # Shared PostgreSQL connection pool
 
 # --- Configuration ---
 # Set up API keys, model names, and server/database configuration
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "Provide your own API key")  # Gemini API key (from env or default)
 GEMINI_MODEL_NAME = "gemini-2.0-flash"  # Gemini model name
+GEMINI_CACHE_SIZE = 512  # Max number of distinct queries whose Gemini responses are memoized
+GEMINI_MAX_WORKERS = 32  # Max concurrent in-flight Gemini calls
+GEMINI_MAX_PENDING = 64  # Max Gemini calls running or queued; further calls are rejected
+GEMINI_TIMEOUT_SECONDS = 30  # How long a request waits for Gemini before giving up
+# System instruction for Gemini, set once on the model instead of prepended to every prompt
+GEMINI_CONTEXT = "You are a travel agent. Only answer questions about country, state, cities, places in cities and what it is like to visit there or famous for, hotels/resorts/stays, travel planning, price details and travel related details of country. If a question is outside of this context, respond with: 'Hi, I'm an travel Agent and ask me question only about travel/country/state/city/stay/travel planning related details. Thank you!'"
 FLASK_HOST = "0.0.0.0"  # Listen on all interfaces
 FLASK_PORT = 5001  # Flask server port
+WSGI_THREADS = int(os.environ.get("WSGI_THREADS", "16"))  # Concurrent request threads served by waitress
 
 # PostgreSQL Database Configuration
 # Read from environment variables with sensible defaults
@@ -25,16 +44,97 @@ DB_CONFIG = {
     "host": os.environ.get("DB_HOST", "localhost"),
     "port": os.environ.get("DB_PORT", "5432")
 }
+# Set DB_PGBOUNCER=1 when DB_HOST/DB_PORT point at PgBouncer in transaction pooling mode
+DB_PGBOUNCER = os.environ.get("DB_PGBOUNCER", "0") == "1"
+DB_POOL_MIN_SIZE = 2  # Connections kept open by the pool
+DB_POOL_MAX_SIZE = 8  # Upper bound on concurrent connections
+DB_POOL_TIMEOUT = 10  # Seconds to wait for a free connection
+DB_POOL_WARMUP_TIMEOUT = 5  # Seconds to wait for min_size connections at startup
+
+db_pool = None  # Global connection pool, created by init_db_pool()
+gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_MAX_WORKERS, thread_name_prefix="gemini")  # Shared pool for Gemini calls
+gemini_slots = threading.BoundedSemaphore(GEMINI_MAX_PENDING)  # Bounds the executor's otherwise unbounded queue
+
+# In-process cache for database lookups that rarely change
+DB_CACHE_TTL_SECONDS = 300  # How long cached query results stay fresh
+_db_cache = {}  # Maps cache key -> (timestamp, value)
+_db_cache_lock = threading.Lock()  # Guards _db_cache across Flask threads
+
+# In-process LRU cache for Gemini responses, keyed by normalized query
+_gemini_cache = OrderedDict()  # Maps lowercased/stripped query -> response text
+_gemini_cache_lock = threading.Lock()  # Guards _gemini_cache across Flask threads
+
+# --- Database Connection Helpers ---
+def init_db_pool():
+    """Creates the shared PostgreSQL connection pool and registers it for shutdown."""
+    global db_pool
+    if db_pool is None:
+        db_pool = ConnectionPool(
+            conninfo=make_conninfo(**DB_CONFIG),
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            timeout=DB_POOL_TIMEOUT,
+            # Server-side prepared statements don't survive transaction-mode PgBouncer
+            kwargs={"prepare_threshold": None} if DB_PGBOUNCER else None,
+            open=True,
+        )  # Connections are opened in the background
+        atexit.register(db_pool.close)  # Release connections on interpreter exit
+    return db_pool
 
-# --- Database Connection Helper ---
 def get_db_connection():
-    """Establishes and returns a new PostgreSQL database connection."""
+    """
+    Returns a context manager yielding a pooled PostgreSQL connection.
+    Inside a Flask request, one connection is checked out lazily and reused for
+    every query in that request; it is returned by release_db_connection().
+    Outside a request, the connection is returned to the pool when the block exits.
+    """
+    if not has_request_context():
+        return init_db_pool().connection()
+    if "db_ctx" not in g:
+        db_ctx = init_db_pool().connection()  # Checked out on first use only
+        conn = db_ctx.__enter__()  # May raise (e.g. PoolTimeout); g stays untouched so the next call retries
+        g.db_ctx, g.db = db_ctx, conn
+    return _request_db_connection(g.db)
+
+@contextlib.contextmanager
+def _request_db_connection(conn):
+    """Yields the request-scoped connection, rolling back on DB errors so later queries still work."""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)  # Connect to PostgreSQL
-        return conn  # Return connection object
-    except psycopg2.Error as e:
-        print(f"Error connecting to PostgreSQL database: {e}", file=sys.stderr)  # Print error
-        return None  # Return None on failure
+        yield conn
+    except psycopg.Error:
+        conn.rollback()  # Clear the aborted transaction
+        raise
+
+# --- Cache Helpers ---
+def _cache_get(key):
+    """Returns the cached value for key, or None if missing or expired."""
+    with _db_cache_lock:
+        entry = _db_cache.get(key)
+        if entry and time.monotonic() - entry[0] < DB_CACHE_TTL_SECONDS:
+            return entry[1]  # Still fresh
+        _db_cache.pop(key, None)  # Drop stale entry
+        return None
+
+def _cache_set(key, value):
+    """Stores value under key with the current timestamp."""
+    with _db_cache_lock:
+        _db_cache[key] = (time.monotonic(), value)
+
+def _gemini_cache_get(key):
+    """Returns the cached Gemini response for key, or None if missing."""
+    with _gemini_cache_lock:
+        text = _gemini_cache.get(key)
+        if text is not None:
+            _gemini_cache.move_to_end(key)  # Mark as most recently used
+        return text
+
+def _gemini_cache_set(key, text):
+    """Stores a Gemini response, evicting the least recently used entry when full."""
+    with _gemini_cache_lock:
+        _gemini_cache[key] = text
+        _gemini_cache.move_to_end(key)
+        if len(_gemini_cache) > GEMINI_CACHE_SIZE:
+            _gemini_cache.popitem(last=False)  # Evict oldest entry
 
 # --- AI Agent Class ---
 class TravelAIAgent:
@@ -48,53 +148,68 @@ class TravelAIAgent:
         # Configure Gemini model
         try:
             genai.configure(api_key=api_key)  # Set API key
-            self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)  # Create model instance
+            self.model = genai.GenerativeModel(GEMINI_MODEL_NAME, system_instruction=GEMINI_CONTEXT)  # Create model instance
         except Exception as e:
             print(f"Error configuring Gemini API: {e}. Gemini functionality is not intended for general queries as per user request.", file=sys.stderr)
             self.model = None  # Set model to None on failure
 
-    def _get_cities_from_db(self) -> list[str]:
-        """Queries the database for a list of distinct hotel locations (cities)."""
-        cities = []  # List to store city names
-        conn = get_db_connection()  # Get DB connection
-        if conn:
-            try:
+    def _get_city_map_from_db(self) -> dict[str, list[str]]:
+        """
+        Queries the database for distinct hotel locations (cities), using the TTL cache.
+        Returns a map from lowercased city name to every spelling stored in the database
+        (e.g. "Basel" and "basel"), in alphabetical order.
+        """
+        cached = _cache_get("cities")
+        if cached is not None:
+            return cached  # Serve from cache
+        city_map = {}  # Lowercased city -> stored spellings
+        try:
+            with get_db_connection() as conn:  # Borrow a pooled connection
                 with conn.cursor() as cur:
-                    cur.execute("SELECT DISTINCT location FROM hotels ORDER BY location;")  # Query for unique cities
+                    cur.execute("SELECT location FROM hotels GROUP BY location ORDER BY location;")  # Query for unique cities
                     for row in cur:
-                        cities.append(row[0])  # Add city to list
-                print(f"Found cities: {', '.join(cities)}")  # Log found cities
-            except psycopg2.Error as e:
-                print(f"Error querying cities from DB: {e}", file=sys.stderr)  # Log error
-            finally:
-                conn.close()  # Always close connection
-        return cities  # Return list of cities
-
-    def _get_hotels_by_location_from_db(self, location: str) -> list[dict]:
-        """Queries the database for hotels in a specific location."""
+                        city_map.setdefault(row[0].lower(), []).append(row[0])  # Group spellings that differ only by case
+            print(f"Found cities: {', '.join(self._cities_from_map(city_map))}")  # Log found cities
+            _cache_set("cities", city_map)  # Cache successful result
+        except psycopg.Error as e:
+            print(f"Error querying cities from DB: {e}", file=sys.stderr)  # Log error
+        return city_map
+
+    def _get_cities_from_db(self) -> list[str]:
+        """Returns the list of distinct hotel locations (cities)."""
+        return self._cities_from_map(self._get_city_map_from_db())
+
+    @staticmethod
+    def _cities_from_map(city_map: dict[str, list[str]]) -> list[str]:
+        """Flattens a city map back into the list of stored locations."""
+        return [city for spellings in city_map.values() for city in spellings]
+
+    def _get_hotels_by_location_from_db(self, locations: list[str]) -> list[dict]:
+        """
+        Queries the database for hotels in a specific location, using the TTL cache.
+        Expects the location's spellings as stored in the database (see _get_city_map_from_db).
+        """
+        location = locations[0]  # For logging
+        cache_key = ("hotels", tuple(locations))
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached  # Serve from cache
         hotels = []  # List to store hotel info
-        conn = get_db_connection()  # Get DB connection
-        if conn:
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT name, location, price_tier, checkin_date, checkout_date, booked FROM hotels WHERE LOWER(location) = LOWER(%s);", (location,))  # Query for hotels in location
-                    for row in cur:
-                        # Convert date objects to strings for JSON serialization
-                        checkin = row[3].strftime("%Y-%m-%d") if isinstance(row[3], date) else str(row[3])
-                        checkout = row[4].strftime("%Y-%m-%d") if isinstance(row[4], date) else str(row[4])
-                        hotels.append({
-                            "name": row[0],
-                            "location": row[1],
-                            "price_tier": row[2],
-                            "checkin_date": checkin,
-                            "checkout_date": checkout,
-                            "booked": row[5]
-                        })  # Add hotel dict to list
-                print(f"Found {len(hotels)} hotels in {location}.")  # Log number of hotels
-            except psycopg2.Error as e:
-                print(f"Error querying hotels for {location} from DB: {e}", file=sys.stderr)  # Log error
-            finally:
-                conn.close()  # Always close connection
+        try:
+            with get_db_connection() as conn:  # Borrow a pooled connection
+                with conn.cursor(row_factory=dict_row) as cur:
+                    # Exact match on the stored spellings uses the hotels_location_idx index
+                    cur.execute("SELECT name, location, price_tier, checkin_date, checkout_date, booked FROM hotels WHERE location = ANY(%s);", (locations,))  # Query for hotels in location
+                    rows = cur.fetchall()
+            # Convert date objects to strings for JSON serialization
+            hotels = [
+                {**row, "checkin_date": row["checkin_date"].isoformat(), "checkout_date": row["checkout_date"].isoformat()}
+                for row in rows
+            ]
+            print(f"Found {len(hotels)} hotels in {location}.")  # Log number of hotels
+            _cache_set(cache_key, hotels)  # Cache successful result
+        except psycopg.Error as e:
+            print(f"Error querying hotels for {location} from DB: {e}", file=sys.stderr)  # Log error
         return hotels  # Return list of hotels
 
     def _query_gemini(self, prompt: str) -> str:
@@ -105,19 +220,44 @@ class TravelAIAgent:
         if not self.model:
             return "AI functionality is not available due to missing or invalid API key."
         print(f"Querying Gemini AI with prompt: '{prompt}' (Note: This is not for general queries as per user config)...")
-        context = "You are a travel agent. Only answer questions about country, state, cities, places in cities and what it is like to visit there or famous for, hotels/resorts/stays, travel planning, price details and travel related details of country. If a question is outside of this context, respond with: 'Hi, I'm an travel Agent and ask me question only about travel/country/state/city/stay/travel planning related details. Thank you!'"  # Context for Gemini
-        prompt_with_context = f"{context}\n\nUser query: {prompt}"  # Combine context and user prompt
+        cache_key = prompt.lower().strip()  # Identical queries (ignoring case) share a cache entry
+        cached = _gemini_cache_get(cache_key)
+        if cached is not None:
+            print("Gemini AI response served from cache.")
+            return cached
+        if not gemini_slots.acquire(blocking=False):
+            print("Gemini AI queue is full; rejecting query.", file=sys.stderr)  # Log overload
+            return "The AI is busy right now. Please try again shortly."
         try:
-            response = self.model.generate_content(prompt_with_context)  # Query Gemini
-            if response and response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                text = response.candidates[0].content.parts[0].text  # Extract text
-                print("Gemini AI response received.")
-                return text  # Return Gemini response
-            else:
-                return "Gemini AI did not return a valid response."
+            # Run on the shared Gemini executor so slow calls are bounded by a timeout
+            future = gemini_executor.submit(self._generate_gemini_text, prompt)  # Send the user's original text
         except Exception as e:
+            gemini_slots.release()  # Submit failed (e.g. executor shut down)
             print(f"Error querying Gemini AI: {e}", file=sys.stderr)  # Log error
             return f"Error communicating with AI: {e}"
+        future.add_done_callback(lambda _: gemini_slots.release())  # Free the slot when done or cancelled
+        try:
+            text = future.result(timeout=GEMINI_TIMEOUT_SECONDS)
+            if text is None:
+                return "Gemini AI did not return a valid response."  # Not cached
+            print("Gemini AI response received.")
+            _gemini_cache_set(cache_key, text)  # Cache successful responses only
+            return text  # Return Gemini response
+        except FutureTimeoutError:
+            future.cancel()  # Drop the call if it is still queued; the client has given up
+            print(f"Gemini AI did not respond within {GEMINI_TIMEOUT_SECONDS}s.", file=sys.stderr)  # Log timeout
+            return "The AI is taking too long to respond. Please try again."
+        except Exception as e:
+            print(f"Error querying Gemini AI: {e}", file=sys.stderr)  # Log error
+            return f"Error communicating with AI: {e}"
+
+    def _generate_gemini_text(self, prompt: str) -> Optional[str]:
+        """Queries Gemini and returns the response text, or None if the response has no text."""
+        # System context is set on the model; the deadline bounds the call itself, not just the wait for it
+        response = self.model.generate_content(prompt, request_options={"timeout": GEMINI_TIMEOUT_SECONDS})
+        if response and response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+            return response.candidates[0].content.parts[0].text  # Extract text
+        return None
 
     def handle_query(self, user_query: str) -> str:
         """
@@ -125,51 +265,92 @@ class TravelAIAgent:
         Any other context or general query is now explicitly rejected.
         """
         user_query_lower = user_query.lower().strip()  # Normalize query
-        # Check for city list queries
-        if user_query_lower == "list cities" or user_query_lower == "show cities":
-            cities = self._get_cities_from_db()  # Get cities from DB
-            if cities:
-                return "Available cities: " + ", ".join(cities) + "."  # Return city list
-            else:
-                return "Could not retrieve city list from database. Please ensure the database is running and accessible."
-        # Check for hotel queries by location
-        elif user_query_lower.startswith("hotels in "):
-            location = user_query_lower.replace("hotels in ", "").strip()  # Extract location
-            hotels = self._get_hotels_by_location_from_db(location)  # Get hotels from DB
-            if hotels:
-                response_str = f"Hotels in {location.title()}:\n"  # Start response string
-                for hotel in hotels:
-                    booked_status = "Booked" if hotel['booked'] else "Available"  # Determine booking status
-                    response_str += (f"- {hotel['name']} ({hotel['price_tier']}) - "
-                                     f"Check-in: {hotel['checkin_date']}, Check-out: {hotel['checkout_date']} "
-                                     f"Status: {booked_status}\n")  # Add hotel info
-                return response_str.strip()  # Return formatted hotel list
-            else:
-                return f"No hotels found in {location.title()} in our database, or an error occurred."
-        # Alternate phrasing for hotel queries
-        elif user_query_lower.startswith("find hotels in "):
-            location = user_query_lower.replace("find hotels in ", "").strip()  # Extract location
-            hotels = self._get_hotels_by_location_from_db(location)  # Get hotels from DB
+        # Exact-match commands are a single dict lookup
+        command = COMMANDS.get(user_query_lower)
+        if command:
+            return command(self)
+        # Check for hotel queries by location ("hotels in X" / "find hotels in X")
+        match = HOTELS_QUERY_RE.match(user_query_lower)
+        if match:
+            header = "Hotels found in" if match.group("find") else "Hotels in"
+            return self._hotels_response(match.group("loc").strip(), header)
+        # Fallback: query Gemini for unsupported/general queries
+        return self._query_gemini(user_query)
+
+    def _cities_response(self) -> str:
+        """Builds the response for city list queries."""
+        cities = self._get_cities_from_db()  # Get cities from DB
+        if cities:
+            return "Available cities: " + ", ".join(cities) + "."  # Return city list
+        return "Could not retrieve city list from database. Please ensure the database is running and accessible."
+
+    def _hotels_response(self, location: str, header: str = "Hotels in") -> str:
+        """Builds the response for hotel queries in a (lowercased) location."""
+        spellings = self._get_city_map_from_db().get(location)  # Stored city names, if known
+        if spellings:
+            hotels = self._get_hotels_by_location_from_db(spellings)  # Get hotels from DB
             if hotels:
-                response_str = f"Hotels found in {location.title()}:\n"  # Start response string
-                for hotel in hotels:
-                    booked_status = "Booked" if hotel['booked'] else "Available"  # Determine booking status
-                    response_str += (f"- {hotel['name']} ({hotel['price_tier']}) - "
-                                     f"Check-in: {hotel['checkin_date']}, Check-out: {hotel['checkout_date']} "
-                                     f"Status: {booked_status}\n")  # Add hotel info
-                return response_str.strip()  # Return formatted hotel list
-            else:
-                return f"No hotels found in {location.title()} in our database, or an error occurred."
-        else:
-            # Fallback: query Gemini for unsupported/general queries
-            gemini_response = self._query_gemini(user_query)
-            return gemini_response
+                return _format_hotels(hotels, spellings[0], header)  # Return formatted hotel list
+        return f"No hotels found in {location.title()} in our database, or an error occurred."
+
+# --- Query Dispatch ---
+# Exact-match queries mapped to their handler
+COMMANDS = {
+    "list cities": TravelAIAgent._cities_response,
+    "show cities": TravelAIAgent._cities_response,
+}
+# Hotel queries by location, with an optional "find " prefix
+HOTELS_QUERY_RE = re.compile(r"^(?P<find>find )?hotels in (?P<loc>.+)$")
+
+def _format_hotels(hotels: list[dict], location: str, header: str = "Hotels in") -> str:
+    """Formats a list of hotel dicts as a human-readable response."""
+    lines = [
+        f"- {hotel['name']} ({hotel['price_tier']}) - "
+        f"Check-in: {hotel['checkin_date']}, Check-out: {hotel['checkout_date']} "
+        f"Status: {'Booked' if hotel['booked'] else 'Available'}"
+        for hotel in hotels
+    ]  # One line per hotel
+    return f"{header} {location}:\n" + "\n".join(lines)
 
 # --- Flask App Setup ---
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Builds a JSON response from orjson's bytes without a str round trip."""
+        # Same argument handling as jsonify(): one positional value, several as a list, or keyword args as a dict
+        if args and kwargs:
+            raise TypeError("response() takes either args or kwargs, not both")
+        if not args and not kwargs:
+            obj = None
+        elif len(args) == 1:
+            obj = args[0]
+        else:
+            obj = list(args) if args else kwargs
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 app = Flask(__name__)  # Create Flask app
+app.json = OrjsonProvider(app)  # Serialize JSON with orjson
 CORS(app)  # Enable CORS for the entire app
 agent_instance = None  # Global instance of our AI agent
 
+@app.teardown_request
+def release_db_connection(exc):
+    """Returns the request-scoped DB connection (if any) to the pool."""
+    db_ctx = g.pop("db_ctx", None)
+    g.pop("db", None)
+    if db_ctx is not None:
+        try:
+            db_ctx.__exit__(type(exc) if exc else None, exc, exc.__traceback__ if exc else None)  # Commits or rolls back
+        except Exception as e:  # Teardown must not raise
+            print(f"Error releasing DB connection: {e}", file=sys.stderr)  # Log error
+
 @app.route('/query_ai', methods=['POST'])
 def query_ai_endpoint():
     """
@@ -189,19 +370,25 @@ def query_ai_endpoint():
 pass  # No-op (placeholder)
 
 def run_flask_app(host, port):
-    """Runs the Flask app in a blocking manner."""
-    app.run(host=host, port=port, debug=False, use_reloader=False)  # Start Flask server
+    """Serves the Flask app with waitress in a blocking manner."""
+    serve(app, host=host, port=port, threads=WSGI_THREADS)  # Start multi-threaded WSGI server
 
 def init_agent_async():
-    """Initializes the agent and tests DB connection."""
-    global agent_instance
+    """Initializes the agent, prewarms the DB pool and tests the DB connection."""
+    global agent_instance, db_pool
     agent_instance = TravelAIAgent(GEMINI_API_KEY)  # Create agent instance
-    # Test DB connection on startup
-    conn = get_db_connection()
-    if conn:
-        print("Successfully connected to PostgreSQL database.")
-        conn.close()
-    else:
+    # Prewarm the pool so the first request doesn't pay the connect cost, then probe it
+    try:
+        try:
+            init_db_pool().wait(timeout=DB_POOL_WARMUP_TIMEOUT)  # Open min_size connections
+        except PoolTimeout:
+            db_pool = None  # wait() closes the pool on timeout; let the next request build a fresh one
+            raise
+        with get_db_connection() as conn:
+            conn.execute("SELECT 1;")  # Cheap health probe
+            print("Successfully connected to PostgreSQL database.")
+    except psycopg.Error as e:
+        print(f"Error connecting to PostgreSQL database: {e}", file=sys.stderr)
         print("Failed to connect to PostgreSQL database. Database queries will not work. Please check DB_CONFIG.")
 
 if __name__ == "__main__":
@@ -213,9 +400,8 @@ if __name__ == "__main__":
     print("Example queries: 'list cities', 'hotels in Zurich'")
     print("Any other query will be rejected.")
     print("Press Ctrl+C to stop the server.")
-    # Run Flask in a separate thread so the main thread can continue to manage the asyncio loop
-    flask_thread = threading.Thread(target=run_flask_app, args=(FLASK_HOST, FLASK_PORT,))  # Create thread
-    flask_thread.daemon = True  # Allow main program to exit even if thread is running
-    flask_thread.start()  # Start Flask server in thread
-    while True:
-        pass  # Keep main thread alive
+    # Run Flask on the main thread; it blocks until the server is stopped
+    try:
+        run_flask_app(FLASK_HOST, FLASK_PORT)
+    finally:
+        gemini_executor.shutdown(wait=False, cancel_futures=True)  # Drop queued Gemini calls on shutdown